@@ -1,12 +1,28 @@
 import logging
 from datetime import datetime
+import aiohttp
 import discord
+from aiolimiter import AsyncLimiter
 
 logger = logging.getLogger(__name__)
 
+# Discord allows roughly 5 messages per 5 seconds per channel
+POST_RATE_LIMIT = 5
+POST_RATE_PERIOD = 5.0
+
+# Discord limits for a single message carrying several embeds
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_EMBED_DESCRIPTION = 4096
+
 class DiscordSummaryClient:
     """Client for posting summaries to Discord"""
     
+    __slots__ = ('client', 'token', 'on_ready_callbacks', '_connector', '_limiter')
+    
+    # Sidebar color for summary embeds
+    _EMBED_COLOR = 0x3498db
+    
     def __init__(self, token):
         """
         Initialize Discord client
@@ -16,9 +32,16 @@ class DiscordSummaryClient:
         """
         intents = discord.Intents.default()
         intents.message_content = True
-        self.client = discord.Client(intents=intents)
+        
+        # Keep-alive connection pool shared by every Discord API request,
+        # so repeated posts reuse TCP/TLS connections
+        self._connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=75)
+        self.client = discord.Client(intents=intents, connector=self._connector)
         self.token = token
         
+        # Token bucket that spaces out posts to stay under Discord's limits
+        self._limiter = AsyncLimiter(max_rate=POST_RATE_LIMIT, time_period=POST_RATE_PERIOD)
+        
         # Store callbacks
         self.on_ready_callbacks = []
     
@@ -39,7 +62,7 @@ class DiscordSummaryClient:
             """
             Triggered when Discord client successfully connects
             """
-            logger.info(f'Discord client logged in as {self.client.user}')
+            logger.info('Discord client logged in as %s', self.client.user)
             
             # Execute all registered callbacks
             for callback in self.on_ready_callbacks:
@@ -48,7 +71,35 @@ class DiscordSummaryClient:
         # Start the client
         await self.client.start(self.token)
     
-    async def post_summary(self, channel_id, summary, title="Telegram Channel Summary", provider_name="AI"):
+    async def close(self):
+        """Close the Discord connection and release pooled HTTP connections"""
+        if not self.client.is_closed():
+            await self.client.close()
+        if not self._connector.closed:
+            await self._connector.close()
+    
+    async def _send(self, channel, **kwargs):
+        """
+        Send a message through the rate limiter
+        
+        discord.py already waits out and retries 429 responses itself; the
+        limiter only spaces posts out so those are rarely hit.
+        
+        Args:
+            channel: Discord channel to send to
+            **kwargs: Arguments passed to channel.send
+        """
+        async with self._limiter:
+            return await channel.send(**kwargs)
+    
+    async def post_summary(
+        self,
+        channel_id,
+        summary,
+        title="Telegram Channel Summary",
+        provider_name="AI",
+        date_str=None
+    ):
         """
         Post summary to a Discord channel
         
@@ -57,30 +108,89 @@ class DiscordSummaryClient:
             summary (str): Generated summary
             title (str): Title for the embed
             provider_name (str): Name of the LLM provider
+            date_str (str, optional): Date shown in the title, defaults to today
         """
         try:
             # Get the destination channel
             channel = self.client.get_channel(channel_id)
             
             if not channel:
-                logger.error(f"Discord channel {channel_id} not found")
+                logger.error("Discord channel %s not found", channel_id)
                 return False
             
             # Format the message
-            current_date = datetime.now().strftime("%Y-%m-%d")
+            if date_str is None:
+                date_str = datetime.now().strftime("%Y-%m-%d")
             
             embed = discord.Embed(
-                title=f"{title} ({current_date})",
+                title=f"{title} ({date_str})",
                 description=summary,
-                color=0x3498db
+                color=self._EMBED_COLOR
             )
             embed.set_footer(text=f"Summary by {provider_name}")
             
             # Send the message
-            await channel.send(embed=embed)
-            logger.info(f"Successfully posted summary for '{title}' to Discord channel {channel_id}")
+            await self._send(channel, embed=embed)
+            logger.info("Successfully posted summary for '%s' to Discord channel %s", title, channel_id)
+            return True
+        
+        except Exception as e:
+            logger.error("Error posting to Discord: %s", e)
+            return False
+    
+    async def post_summaries_batch(self, channel_id, entries, provider_name="AI", date_str=None):
+        """
+        Post several summaries using as few Discord messages as possible
+        
+        Embeds are packed into messages of at most 10 embeds and 6000
+        characters, so N summaries usually cost a single request.
+        
+        Args:
+            channel_id (int): Discord channel ID
+            entries (list): (title, summary) tuples to post in order
+            provider_name (str): Name of the LLM provider
+            date_str (str, optional): Date shown in the titles, defaults to today
+        """
+        try:
+            # Get the destination channel
+            channel = self.client.get_channel(channel_id)
+            
+            if not channel:
+                logger.error("Discord channel %s not found", channel_id)
+                return False
+            
+            if date_str is None:
+                date_str = datetime.now().strftime("%Y-%m-%d")
+            
+            # Build embeds and pack them into messages within Discord's limits
+            chunks = [[]]
+            chunk_size = 0
+            for title, summary in entries:
+                embed = discord.Embed(
+                    title=f"{title} ({date_str})",
+                    description=summary[:MAX_EMBED_DESCRIPTION],
+                    color=self._EMBED_COLOR
+                )
+                embed.set_footer(text=f"Summary by {provider_name}")
+                
+                embed_size = len(embed)
+                if chunks[-1] and (
+                    len(chunks[-1]) >= MAX_EMBEDS_PER_MESSAGE
+                    or chunk_size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE
+                ):
+                    chunks.append([])
+                    chunk_size = 0
+                chunks[-1].append(embed)
+                chunk_size += embed_size
+            
+            # Send the messages
+            for chunk in chunks:
+                if chunk:
+                    await self._send(channel, embeds=chunk)
+            
+            logger.info("Successfully posted %d summaries to Discord channel %s", len(entries), channel_id)
             return True
         
         except Exception as e:
-            logger.error(f"Error posting to Discord: {e}")
+            logger.error("Error posting to Discord: %s", e)
             return False
\ No newline at end of file
@@ -1,15 +1,77 @@
 import logging
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from cachetools import LRUCache
 from telethon import TelegramClient
 from telethon.tl.functions.channels import GetForumTopicsRequest
 from telethon.tl.types import Channel, Message
 
 logger = logging.getLogger(__name__)
 
+# Largest page Telegram returns for GetForumTopicsRequest
+FORUM_TOPICS_PAGE_SIZE = 100
+
+async def fetch_forum_topics(client, channel_entity):
+    """
+    Fetch every topic of a forum, page by page
+    
+    Telegram orders topics by their latest message, so each page's cursor
+    is the last topic's top message and that message's date, taken from
+    the messages returned with the page. Pages are fetched in sequence;
+    duplicates are dropped in case pages overlap.
+    
+    Args:
+        client (TelegramClient): Connected Telegram client
+        channel_entity: Resolved forum channel entity
+        
+    Returns:
+        list: Topic objects in the order Telegram returned them
+    """
+    topics = {}
+    offset_date, offset_id, offset_topic = 0, 0, 0
+    while True:
+        topics_result = await client(GetForumTopicsRequest(
+            channel=channel_entity,
+            offset_date=offset_date,
+            offset_id=offset_id,
+            offset_topic=offset_topic,
+            limit=FORUM_TOPICS_PAGE_SIZE
+        ))
+        page = topics_result.topics
+        new_topics = [topic for topic in page if topic.id not in topics]
+        for topic in new_topics:
+            topics[topic.id] = topic
+        
+        if len(page) < FORUM_TOPICS_PAGE_SIZE or not new_topics:
+            break
+        
+        last_topic = page[-1]
+        offset_id = getattr(last_topic, 'top_message', 0)
+        top_message = next(
+            (message for message in topics_result.messages if message.id == offset_id),
+            None
+        )
+        offset_date = getattr(top_message, 'date', None) or 0
+        offset_topic = last_topic.id
+    return list(topics.values())
+
 class TelegramChannelClient:
     """Client for interacting with Telegram channels and topics"""
     
-    def __init__(self, api_id, api_hash, phone_number, session_name='telegram_to_discord_bot'):
+    __slots__ = (
+        'client',
+        'phone_number',
+        '_channel_entity_cache',
+    )
+    
+    def __init__(
+        self,
+        api_id,
+        api_hash,
+        phone_number,
+        session_name='telegram_to_discord_bot',
+        entity_cache_size=256
+    ):
         """
         Initialize Telegram client
         
@@ -18,70 +80,97 @@ class TelegramChannelClient:
             api_hash (str): Telegram API hash
             phone_number (str): Phone number for authentication
             session_name (str): Name for the session file
+            entity_cache_size (int): Maximum number of channel entities kept in memory
         """
         self.client = TelegramClient(session_name, api_id, api_hash)
         self.phone_number = phone_number
-        # Store the channel entity once found for reuse
-        self._channel_entity_cache = {}
+        # Store channel entities once found for reuse, bounded so long-running
+        # processes don't accumulate every channel ever resolved
+        self._channel_entity_cache = LRUCache(maxsize=entity_cache_size)    
+    async def is_authorized(self):
+        """
+        Connect and check whether the session is already logged in
+        
+        Returns:
+            bool: True if start() will not need to ask for a login code
+        """
+        await self.client.connect()
+        return await self.client.is_user_authorized()
     
     async def start(self):
         """Start the Telegram client"""
         await self.client.start(phone=self.phone_number)
         logger.info("Telegram client started")
     
+    def clear_entity_cache(self):
+        """Drop all cached channel entities so they are re-resolved on next use"""
+        self._channel_entity_cache.clear()
+    
+    @staticmethod
+    def _channel_id_candidates(channel_id):
+        """
+        List the forms of a channel identifier worth looking up, in order
+        
+        Numeric IDs are first tried with the -100 prefix used for channels
+        and supergroups, whether they were passed with it, with a bare minus
+        sign, or without any prefix, and then as given, which is how legacy
+        basic groups (e.g. -4001234) are addressed. Usernames are returned
+        unchanged.
+        
+        Args:
+            channel_id: Channel username or ID in various possible formats
+            
+        Returns:
+            tuple: Marked channel ID then raw ID, or just the original username
+        """
+        channel_id_str = str(channel_id).strip()
+        if not channel_id_str.lstrip('-').isdigit():
+            return (channel_id_str,)
+        
+        if channel_id_str.startswith('-100'):
+            base_id = channel_id_str[4:]
+        else:
+            base_id = channel_id_str.lstrip('-')
+        marked_id = int(f"-100{base_id}")
+        raw_id = int(channel_id_str)
+        return (marked_id,) if raw_id == marked_id else (marked_id, raw_id)
+    
     async def _get_channel_entity(self, channel_id):
         """
-        Get channel entity with multiple format attempts
+        Get channel entity, normalizing the ID so only one lookup is needed
         
         Args:
             channel_id: Channel ID in various possible formats
             
         Returns:
-            The channel entity or None if not found
+            The channel entity
+            
+        Raises:
+            ValueError: If the channel cannot be found
         """
         # Check cache first
-        if channel_id in self._channel_entity_cache:
-            return self._channel_entity_cache[channel_id]
-            
-        channel_id_str = str(channel_id)
-        channel_entity = None
-        errors = []
+        key = str(channel_id)
+        cached_entity = self._channel_entity_cache.get(key)
+        if cached_entity is not None:
+            return cached_entity
         
-        # Attempt 1: Try as is (string or int)
-        try:
-            channel_entity = await self.client.get_entity(channel_id)
-        except Exception as e:
-            errors.append(f"Original format failed: {str(e)}")
-        
-        # Attempt 2: If it's a string that starts with -100, try without that prefix
-        if not channel_entity and channel_id_str.startswith('-100') and channel_id_str[4:].isdigit():
-            try:
-                peer_id = int(channel_id_str[4:])
-                channel_entity = await self.client.get_entity(peer_id)
-            except Exception as e:
-                errors.append(f"Without -100 prefix failed: {str(e)}")
-        
-        # Attempt 3: If numeric but doesn't start with -100, try adding that prefix
-        if not channel_entity and channel_id_str.lstrip('-').isdigit() and not channel_id_str.startswith('-100'):
-            # Handle cases with just - prefix
-            if channel_id_str.startswith('-'):
-                base_id = channel_id_str[1:]
-            else:
-                base_id = channel_id_str
-                
+        # Telethon's session file already remembers the channel's access
+        # hash across restarts, so this is usually a single request even on
+        # startup; the raw ID is only tried when the marked one fails
+        errors = []
+        for peer in self._channel_id_candidates(channel_id):
             try:
-                peer_id = int(f"-100{base_id}")
-                channel_entity = await self.client.get_entity(peer_id)
+                channel_entity = await self.client.get_entity(peer)
+                break
             except Exception as e:
-                errors.append(f"With -100 prefix failed: {str(e)}")
-        
-        if not channel_entity:
-            error_msg = f"Cannot find channel with ID {channel_id}. Tried multiple formats."
+                errors.append(f"{peer}: {e}")
+        else:
+            error_msg = f"Cannot find channel with ID {channel_id} (tried {'; '.join(errors)})"
             logger.error(error_msg)
             raise ValueError(error_msg)
         
         # Cache the entity for future use
-        self._channel_entity_cache[channel_id] = channel_entity
+        self._channel_entity_cache[key] = channel_entity
         return channel_entity
     
     async def get_forum_topics(self, channel_id):
@@ -100,84 +189,80 @@ class TelegramChannelClient:
             
             # Check if this is a forum (supergroup with topics)
             if not hasattr(channel_entity, 'forum') or not channel_entity.forum:
-                logger.info(f"Channel {channel_id} is not a forum/group with topics")
+                logger.info("Channel %s is not a forum/group with topics", channel_id)
                 return []
             
-            # Get all topics in the forum
-            topics_result = await self.client(GetForumTopicsRequest(
-                channel=channel_entity,
-                offset_date=0,
-                offset_id=0,
-                offset_topic=0,
-                limit=100  # Maximum limit, might need pagination for very large forums
-            ))
+            topics = await fetch_forum_topics(self.client, channel_entity)
             
-            logger.info(f"Found {len(topics_result.topics)} topics in forum {channel_entity.title}")
-            return topics_result.topics
+            logger.info("Found %d topics in forum %s", len(topics), channel_entity.title)
+            return topics
             
         except Exception as e:
-            logger.error(f"Error getting forum topics: {e}")
+            logger.error("Error getting forum topics: %s", e)
             return []
     
-    async def collect_messages(self, channel_identifier, topic_id=None, days=1):
+    async def collect_messages(
+        self,
+        channel_identifier,
+        topic_id=None,
+        days=1,
+        max_messages=2000,
+        after=None
+    ):
         """
         Collect messages from a channel/group and optionally from a specific topic
         
         Args:
             channel_identifier (str/int): Channel username or ID
             topic_id (int, optional): Topic ID within the forum
-            days (int): Number of days to look back
+            days (int): Number of days to look back, used when after is not given
+            max_messages (int): Keep at most this many of the most recent messages
+            after (datetime, optional): Only collect messages sent after this time
             
         Returns:
-            list: List of message texts with sender information
+            list: List of (sender, text) tuples
         """
         try:
             # Calculate time threshold
-            time_threshold = datetime.now() - timedelta(days=days)
+            time_threshold = after
+            if time_threshold is None:
+                time_threshold = datetime.now(timezone.utc) - timedelta(days=days)
             
             # Get the channel entity using our robust method
             channel_entity = await self._get_channel_entity(channel_identifier)
             
-            # Collect messages
-            message_texts = []
-            
-            # If topic_id is provided, collect messages from that topic
+            # Collect messages from the main channel/group, or only from the
+            # given topic when topic_id is provided
+            iter_kwargs = dict(entity=channel_entity, offset_date=time_threshold, reverse=True)
             if topic_id is not None:
-                async for message in self.client.iter_messages(
-                    channel_entity,
-                    offset_date=time_threshold,
-                    reverse=True,
-                    reply_to=topic_id  # This filters for messages in the specific topic
-                ):
-                    if not message.text:
-                        continue
-                    
-                    # Get sender info
-                    sender = await self._get_sender_display_name(message)
-                    message_texts.append(f"{sender}: {message.text}")
-            else:
-                # Collect messages from the main channel/group
-                async for message in self.client.iter_messages(
-                    channel_entity,
-                    offset_date=time_threshold,
-                    reverse=True
-                ):
-                    if not message.text:
-                        continue
-                    
-                    # Get sender info
-                    sender = await self._get_sender_display_name(message)
-                    message_texts.append(f"{sender}: {message.text}")
+                iter_kwargs['reply_to'] = topic_id
+            
+            # Bounded so busy channels keep only the most recent messages
+            raw_messages = deque(maxlen=max_messages)
+            async for message in self.client.iter_messages(**iter_kwargs):
+                if message.text:
+                    raw_messages.append(message)
             
-            logger.info(f"Collected {len(message_texts)} messages from {channel_entity.title}" + 
-                      (f" topic {topic_id}" if topic_id else ""))
+            # Keep sender and text separate; they are only formatted into
+            # transcript lines once, when handed to the summarizer. Senders
+            # come with the fetched messages, so no extra requests are made.
+            message_texts = [
+                (self._get_sender_display_name(message), message.text)
+                for message in raw_messages
+            ]
+            
+            if topic_id:
+                logger.info("Collected %d messages from %s topic %s",
+                            len(message_texts), channel_entity.title, topic_id)
+            else:
+                logger.info("Collected %d messages from %s", len(message_texts), channel_entity.title)
             return message_texts
         
         except Exception as e:
-            logger.error(f'Error collecting Telegram messages: {e}')
+            logger.error('Error collecting Telegram messages: %s', e)
             return []
     
-    async def _get_sender_display_name(self, message):
+    def _get_sender_display_name(self, message):
         """
         Get the display name for a message sender
         
@@ -187,14 +272,17 @@ class TelegramChannelClient:
         Returns:
             str: Display name for the sender
         """
-        if not message.sender:
+        sender = message.sender
+        if sender is None:
             return "Unknown"
-            
-        if hasattr(message.sender, 'username') and message.sender.username:
-            return f"@{message.sender.username}"
-        elif hasattr(message.sender, 'first_name') and message.sender.first_name:
-            if hasattr(message.sender, 'last_name') and message.sender.last_name:
-                return f"{message.sender.first_name} {message.sender.last_name}"
-            return message.sender.first_name
+        
+        username = getattr(sender, 'username', None)
+        if username:
+            return f"@{username}"
+        
+        first_name = getattr(sender, 'first_name', None)
+        if first_name:
+            last_name = getattr(sender, 'last_name', None)
+            return f"{first_name} {last_name}" if last_name else first_name
         
         return str(message.sender_id)
\ No newline at end of file
@@ -1,7 +1,13 @@
+import logging
 import os
+import re
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 class LLMProvider(Enum):
     """
     Enumeration of supported Large Language Model (LLM) providers.
@@ -16,10 +22,20 @@ class LLMProvider(Enum):
     DEEPSEEK = "deepseek"
     ANTHROPIC = "anthropic"
 
+# Valid provider strings, computed once at import
+_LLM_PROVIDER_VALUES = [p.value for p in LLMProvider]
+
+# Matches each topic ID in TELEGRAM_TOPIC_IDS, whatever the separator
+_TOPIC_ID_RE = re.compile(r'-?\d+')
+
+@lru_cache(maxsize=1)
 def load_configuration():
     """
     Load and validate configuration from environment variables.
     
+    The result is computed once and cached; subsequent calls return the
+    same read-only mapping without re-reading the environment.
+    
     This function performs the following key tasks:
     - Loads environment variables from .env file
     - Parses and validates configuration settings
@@ -27,7 +43,7 @@ def load_configuration():
     - Retrieves API keys based on selected LLM provider
     
     Returns:
-        dict: A comprehensive configuration dictionary containing:
+        Mapping: A read-only, comprehensive configuration dictionary containing:
             - Telegram API credentials
             - Discord bot configuration
             - LLM provider settings
@@ -41,20 +57,17 @@ def load_configuration():
     dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
     load_dotenv(dotenv_path, override=True)
     
-    # Debug prints
-    print("DEBUG: Detailed LLM Provider Information:")
-    print(f"os.getenv('LLM_PROVIDER'): {repr(os.getenv('LLM_PROVIDER'))}")
-    print(f"ENUM Values: {[p.value for p in LLMProvider]}")
+    logger.debug("Raw LLM_PROVIDER value: %r", os.getenv('LLM_PROVIDER'))
+    logger.debug("Valid LLM providers: %s", _LLM_PROVIDER_VALUES)
     
     # Determine LLM provider
     try:
         # Try to get from environment, but default to Anthropic if not set
         llm_provider_str = os.getenv('LLM_PROVIDER', 'anthropic').strip().lower()
         llm_provider = LLMProvider(llm_provider_str)
-        print(f"DEBUG: Parsed LLM Provider: {llm_provider}")
-        print(f"DEBUG: LLM Provider Type: {type(llm_provider)}")
+        logger.debug("Parsed LLM Provider: %s", llm_provider)
     except ValueError:
-        print(f"ERROR: Invalid LLM Provider: '{llm_provider_str}'. Defaulting to Anthropic.")
+        logger.error("Invalid LLM Provider: '%s'. Defaulting to Anthropic.", llm_provider_str)
         llm_provider = LLMProvider.ANTHROPIC
     
     # Create configuration dictionary
@@ -64,8 +77,11 @@ def load_configuration():
         'TELEGRAM_API_HASH': os.getenv('TELEGRAM_API_HASH'),
         'TELEGRAM_PHONE_NUMBER': os.getenv('TELEGRAM_PHONE_NUMBER'),
         'TELEGRAM_SOURCE_CHANNEL': os.getenv('TELEGRAM_SOURCE_CHANNEL'),
-        'TELEGRAM_TOPIC_IDS': [int(id_str) for id_str in os.getenv('TELEGRAM_TOPIC_IDS', '').split(',') if id_str.strip()],
+        'TELEGRAM_TOPIC_IDS': [int(m) for m in _TOPIC_ID_RE.findall(os.getenv('TELEGRAM_TOPIC_IDS', ''))],
         'INCLUDE_MAIN_CHANNEL': os.getenv('INCLUDE_MAIN_CHANNEL', 'true').lower() == 'true',
+        'MESSAGE_HISTORY_MAX': int(os.getenv('MESSAGE_HISTORY_MAX', 2000)),
+        'HISTORY_DAYS': int(os.getenv('HISTORY_DAYS', 1)),
+        'ENTITY_CACHE_SIZE': int(os.getenv('ENTITY_CACHE_SIZE', 256)),
         
         # Discord configuration
         'DISCORD_TOKEN': os.getenv('DISCORD_TOKEN'),
@@ -77,10 +93,11 @@ def load_configuration():
         
         # Scheduling
         'SUMMARY_HOUR': int(os.getenv('SUMMARY_HOUR', 23)),
-        'SUMMARY_MINUTE': int(os.getenv('SUMMARY_MINUTE', 0))
+        'SUMMARY_MINUTE': int(os.getenv('SUMMARY_MINUTE', 0)),
+        'RUN_ON_STARTUP': os.getenv('RUN_ON_STARTUP', 'false').lower() == 'true'
     }
     
-    return config
+    return MappingProxyType(config)
 
 def _get_llm_api_key(provider):
     """
@@ -99,14 +116,10 @@ def _get_llm_api_key(provider):
     Raises:
         ValueError: If no API key is found for the specified provider.
     """
-    print(f"DEBUG: Getting API key for provider: {provider}")
-    
     if provider == LLMProvider.ANTHROPIC:
         api_key = os.getenv('ANTHROPIC_API_KEY')
-        print("DEBUG: Selected Anthropic API Key")
     elif provider == LLMProvider.DEEPSEEK:
         api_key = os.getenv('DEEPSEEK_API_KEY')
-        print("DEBUG: Selected DeepSeek API Key")
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
     
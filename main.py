@@ -1,6 +1,10 @@
 import asyncio
 import logging
-from datetime import datetime
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import httpx
+from httpx_aiohttp import HttpxAiohttpClient
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # Local imports
@@ -13,9 +17,36 @@ from clients.discord_client import DiscordSummaryClient
 # Set up logging
 logger = setup_logging()
 
+# Seconds to wait for the LLM before falling back to a basic summary
+SUMMARY_TIMEOUT = 120
+
+# Seconds allowed for all per-source summaries of one run together
+SUMMARY_PHASE_TIMEOUT = 300
+
+# Characters of per-source summaries given to the overview, shared equally
+# between sources; kept below the summarizers' transcript limit so no
+# source is dropped
+OVERVIEW_MAX_CHARS = 7000
+
+# Words picked up as topics by the fallback summary, and common ones to skip
+_TOKEN_RE = re.compile(r'[^\W\d_]{6,}')
+_STOP_WORDS = frozenset({'about', 'would', 'should', 'these', 'there', 'their', 'other'})
+
 class TelegramToDiscordBot:
     """Main application that ties together Telegram, Discord, and summarization"""
     
+    __slots__ = (
+        'config',
+        'telegram_client',
+        'discord_client',
+        'summarizer',
+        'scheduler',
+        '_telegram_start_task',
+        '_provider_name',
+        '_destination_channel_id',
+        '_http_client',
+    )
+    
     def __init__(self, config):
         """
         Initialize the application
@@ -25,11 +56,16 @@ class TelegramToDiscordBot:
         """
         self.config = config
         
+        # Posting settings, fixed for the process lifetime
+        self._provider_name = config['LLM_PROVIDER'].name.capitalize()
+        self._destination_channel_id = config['DISCORD_DESTINATION_CHANNEL_ID']
+        
         # Initialize the telegram client
         self.telegram_client = TelegramChannelClient(
             api_id=config['TELEGRAM_API_ID'],
             api_hash=config['TELEGRAM_API_HASH'],
-            phone_number=config['TELEGRAM_PHONE_NUMBER']
+            phone_number=config['TELEGRAM_PHONE_NUMBER'],
+            entity_cache_size=config['ENTITY_CACHE_SIZE']
         )
         
         # Initialize the discord client
@@ -37,14 +73,36 @@ class TelegramToDiscordBot:
             token=config['DISCORD_TOKEN']
         )
         
+        # Connection pool kept for the life of the process, so concurrent and
+        # daily summary requests reuse warm TLS connections. The SDKs accept
+        # any httpx client; this one runs on aiohttp, which holds up much
+        # better than httpx's own transport under many concurrent requests.
+        self._http_client = HttpxAiohttpClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=100,
+                keepalive_expiry=300
+            )
+        )
+        
         # Initialize the summarizer
         self.summarizer = create_summarizer(
             provider=config['LLM_PROVIDER'],
-            api_key=config['LLM_API_KEY']
+            api_key=config['LLM_API_KEY'],
+            http_client=self._http_client
         )
         
-        # Initialize the scheduler
-        self.scheduler = AsyncIOScheduler()
+        # Initialize the scheduler. Missed runs collapse into one and a slow
+        # run is never overlapped by the next one.
+        self.scheduler = AsyncIOScheduler(job_defaults={
+            'coalesce': True,
+            'misfire_grace_time': 3600,
+            'max_instances': 1
+        })
+        
+        # Set by start(); summaries wait on it so they never run before
+        # the Telegram login has finished
+        self._telegram_start_task = None
         
         # Register Discord ready callback
         self.discord_client.add_on_ready_callback(self._setup_scheduler)
@@ -59,75 +117,167 @@ class TelegramToDiscordBot:
         )
         
         logger.info(
-            f"Scheduled daily summary at {self.config.get('SUMMARY_HOUR', 23)}:"
-            f"{self.config.get('SUMMARY_MINUTE', 0)}"
+            "Scheduled daily summary at %s:%s",
+            self.config.get('SUMMARY_HOUR', 23),
+            self.config.get('SUMMARY_MINUTE', 0)
         )
         self.scheduler.start()
         
-        # Add this line to run immediately for testing
-        asyncio.create_task(self._generate_and_post_summary())
+        # Optionally run once right away instead of waiting for the schedule
+        if self.config.get('RUN_ON_STARTUP', False):
+            asyncio.create_task(self._generate_and_post_summary())
     
     async def _generate_and_post_summary(self):
         """Generate and post daily summary for all configured topics"""
+        # Every task started by this run, so none outlive it on error or shutdown
+        run_tasks = []
         try:
+            if self._telegram_start_task is not None:
+                await self._telegram_start_task
+            
             channel_id = self.config['TELEGRAM_SOURCE_CHANNEL']
             topic_ids = self.config['TELEGRAM_TOPIC_IDS']
             include_main = self.config['INCLUDE_MAIN_CHANNEL']
+            max_messages = self.config['MESSAGE_HISTORY_MAX']
+            today = datetime.now().strftime("%Y-%m-%d")
             
-            all_messages = []
-            topic_names = {}
+            # One cutoff shared by every source in this run
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.config['HISTORY_DAYS'])
             
-            # Collect forum topics if we have topic IDs
+            # Launch all Telegram requests at once so their round-trips overlap
+            topics_task = None
             if topic_ids:
-                topics = await self.telegram_client.get_forum_topics(channel_id)
-                # Create a mapping of topic_id to topic_title
-                for topic in topics:
-                    topic_names[topic.id] = topic.title
-            
-            # Collect messages from main channel if requested
-            if include_main:
-                logger.info(f"Collecting messages from main channel")
-                main_messages = await self.telegram_client.collect_messages(
-                    channel_identifier=channel_id
+                topics_task = asyncio.create_task(
+                    self.telegram_client.get_forum_topics(channel_id)
                 )
-                
-                if main_messages:
-                    all_messages.extend(main_messages)
-                    await self._process_and_post_summary(
-                        messages=main_messages,
-                        title="Main Channel"
-                    )
+                run_tasks.append(topics_task)
             
-            # Collect messages from each topic
-            for topic_id in topic_ids:
-                logger.info(f"Collecting messages from topic {topic_id}")
-                topic_messages = await self.telegram_client.collect_messages(
+            async def collect(topic_id):
+                """Collect one source, tagging the result with its topic ID"""
+                messages = await self.telegram_client.collect_messages(
                     channel_identifier=channel_id,
-                    topic_id=topic_id
+                    topic_id=topic_id,
+                    max_messages=max_messages,
+                    after=cutoff
                 )
+                return topic_id, messages
+            
+            # Sources in posting order; None stands for the main channel
+            sources = ([None] if include_main else []) + list(topic_ids)
+            collect_tasks = []
+            for topic_id in sources:
+                if topic_id is None:
+                    logger.info("Collecting messages from main channel")
+                else:
+                    logger.info("Collecting messages from topic %s", topic_id)
+                collect_tasks.append(asyncio.create_task(collect(topic_id)))
+            run_tasks.extend(collect_tasks)
+            
+            # Create a mapping of topic_id to topic_title
+            topic_names = {}
+            if topics_task is not None:
+                topic_names = {topic.id: topic.title for topic in await topics_task}
+            
+            # Start summarizing each source as soon as its messages arrive,
+            # while slower collections are still in flight
+            summary_tasks = {}
+            for next_collection in asyncio.as_completed(collect_tasks):
+                try:
+                    topic_id, messages = await next_collection
+                except Exception as e:
+                    logger.error("Error collecting messages: %s", e)
+                    continue
+                
+                # Clean first, so sources with only noise (very short,
+                # link-only or repeated messages) are skipped, not summarized
+                messages = self.summarizer.clean_messages(messages)
+                if not messages:
+                    continue
                 
-                if topic_messages:
-                    all_messages.extend(topic_messages)
-                    topic_title = topic_names.get(topic_id, f"Topic {topic_id}")
-                    await self._process_and_post_summary(
-                        messages=topic_messages,
-                        title=topic_title
+                if topic_id is None:
+                    title = "Main Channel"
+                else:
+                    title = topic_names.get(topic_id) or f"Topic {topic_id}"
+                summary_task = asyncio.create_task(
+                    self._generate_summary(messages=messages, title=title)
+                )
+                run_tasks.append(summary_task)
+                summary_tasks[topic_id] = (title, messages, summary_task)
+            
+            # Wait for every summary under one deadline, then cancel any
+            # stragglers so they release their HTTP connections
+            if summary_tasks:
+                _, pending = await asyncio.wait(
+                    [task for _, _, task in summary_tasks.values()],
+                    timeout=SUMMARY_PHASE_TIMEOUT
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            
+            # Summaries to post, and the LLM-written ones the overview is built from
+            summaries = []
+            overview_inputs = []
+            for topic_id in sources:
+                if topic_id not in summary_tasks:
+                    continue
+                title, messages, task = summary_tasks[topic_id]
+                if task.cancelled():
+                    logger.error("Summary for %s did not finish within %ss", title, SUMMARY_PHASE_TIMEOUT)
+                    continue
+                error = task.exception()
+                if isinstance(error, asyncio.TimeoutError):
+                    logger.error("Summary generation for %s timed out after %ss", title, SUMMARY_TIMEOUT)
+                    summaries.append((title, self._generate_basic_summary(messages)))
+                    continue
+                if error:
+                    logger.error("Error generating summary for %s: %s", title, error)
+                    continue
+                summaries.append((title, task.result()))
+                overview_inputs.append((title, task.result()))
+            
+            # If we have topics, also create an overall summary. It is built
+            # from the per-source summaries rather than re-sending every
+            # message, which would double the tokens spent per run.
+            if len(topic_ids) > 0 and overview_inputs:
+                try:
+                    overview = await self._generate_summary(
+                        messages=self._fit_overview_input(overview_inputs),
+                        title="All Channels and Topics",
+                        prompt_type='overview'
                     )
+                    summaries.append(("All Channels and Topics", overview))
+                except asyncio.TimeoutError:
+                    logger.error("Overview generation timed out after %ss; skipping it", SUMMARY_TIMEOUT)
+                except Exception as e:
+                    logger.error("Error generating summary for All Channels and Topics: %s", e)
             
-            # If we have topics, also create an overall summary
-            if len(topic_ids) > 0 and all_messages:
-                await self._process_and_post_summary(
-                    messages=all_messages,
-                    title="All Channels and Topics"
+            # Post everything in as few Discord messages as possible
+            if summaries:
+                await self.discord_client.post_summaries_batch(
+                    channel_id=self._destination_channel_id,
+                    entries=[
+                        (f"Telegram Summary: {title}", summary)
+                        for title, summary in summaries
+                    ],
+                    provider_name=self._provider_name,
+                    date_str=today
                 )
             
-            if not all_messages:
+            if not summary_tasks:
                 logger.info("No messages found to summarize in any channel or topic")
         
         except Exception as e:
-            logger.error(f'Daily summary generation and posting failed: {e}')
+            logger.error('Daily summary generation and posting failed: %s', e)
+        
+        finally:
+            leftover_tasks = [task for task in run_tasks if not task.done()]
+            for task in leftover_tasks:
+                task.cancel()
+            if leftover_tasks:
+                await asyncio.gather(*leftover_tasks, return_exceptions=True)
     
-    async def _process_and_post_summary(
+    async def _generate_summary(
         self, 
         messages, 
         title, 
@@ -136,47 +286,118 @@ class TelegramToDiscordBot:
         override_user_prompt=None
     ):
         """
-        Process messages and post summary for a specific topic or channel
+        Generate a summary for a specific topic or channel without posting it
         
         Args:
-            messages (list): List of messages to summarize
+            messages (list): (sender, text) tuples to summarize, or
+                (title, summary) tuples for the 'overview' prompt type
             title (str): Title for the summary (e.g., topic name)
             prompt_type (str, optional): Explicitly specify prompt type
             override_system_prompt (str, optional): Custom system prompt
             override_user_prompt (str, optional): Custom user prompt
+            
+        Returns:
+            str: Generated summary text
+            
+        Raises:
+            asyncio.TimeoutError: If the LLM does not answer within SUMMARY_TIMEOUT
         """
-        if not messages:
-            logger.info(f"No messages found to summarize for {title}")
-            return
-        
         # Generate summary with additional prompt options
-        summary = self.summarizer.generate_summary(
-            messages, 
-            topic_name=title, 
-            prompt_type=prompt_type,
-            override_system_prompt=override_system_prompt,
-            override_user_prompt=override_user_prompt
+        return await asyncio.wait_for(
+            self.summarizer.generate_summary(
+                messages, 
+                topic_name=title, 
+                prompt_type=prompt_type,
+                override_system_prompt=override_system_prompt,
+                override_user_prompt=override_user_prompt
+            ),
+            timeout=SUMMARY_TIMEOUT
         )
+    
+    @staticmethod
+    def _fit_overview_input(summaries):
+        """
+        Shorten per-source summaries so all of them fit in the overview prompt
         
-        # Post to Discord
-        provider_name = self.config['LLM_PROVIDER'].name.capitalize()
-        await self.discord_client.post_summary(
-            channel_id=self.config['DISCORD_DESTINATION_CHANNEL_ID'],
-            summary=summary,
-            title=f"Telegram Summary: {title}",
-            provider_name=provider_name
-        )
+        Each source gets an equal share of OVERVIEW_MAX_CHARS and keeps the
+        start of its summary, rather than the oldest sources being dropped
+        whole when the transcript is cut to length.
+        
+        Args:
+            summaries (list): (title, summary) tuples
+            
+        Returns:
+            list: (title, summary) tuples, each "title: summary" line within its share
+        """
+        share = OVERVIEW_MAX_CHARS // len(summaries)
+        return [
+            # Leave room for the ": " separator and the line break
+            (title, summary[:max(share - len(title) - 3, 0)])
+            for title, summary in summaries
+        ]
+    
+    def _generate_basic_summary(self, messages):
+        """
+        Build a short summary without the LLM, used when it does not answer in time
+        
+        Args:
+            messages (list): Cleaned (sender, text) tuples
+            
+        Returns:
+            str: Message and participant counts, the most active participants
+                and the most frequent words
+        """
+        authors = Counter(sender for sender, _ in messages)
+        topics = Counter()
+        for _, text in messages:
+            # Only the matched words are lowercased, not the whole message
+            topics.update(
+                token for token in map(str.lower, _TOKEN_RE.findall(text))
+                if token not in _STOP_WORDS
+            )
+        
+        lines = [
+            f"Summary generation timed out. {len(messages)} messages "
+            f"from {len(authors)} participants were collected."
+        ]
+        if authors:
+            lines.append("Most active participants: " + ", ".join(
+                f"{author} ({count})" for author, count in authors.most_common(5)
+            ))
+        if topics:
+            lines.append("Topics mentioned: " + ", ".join(
+                token for token, _ in topics.most_common(10)
+            ))
+        return "\n".join(lines)
     
     async def start(self):
         """Start the bot services"""
-        # Start Telegram client
-        await self.telegram_client.start()
+        # Log in to Telegram and Discord concurrently when the Telegram session
+        # is already authorized. A first login asks for a code on the console,
+        # so it has to finish before Discord starts connecting. The Discord
+        # task keeps running the client loop until shutdown.
+        authorized = await self.telegram_client.is_authorized()
+        self._telegram_start_task = asyncio.create_task(self.telegram_client.start())
+        if not authorized:
+            await self._telegram_start_task
+        discord_task = asyncio.create_task(self.discord_client.start())
+        
+        try:
+            await self._telegram_start_task
+        except Exception:
+            discord_task.cancel()
+            raise
         
-        # Start Discord client
-        await self.discord_client.start()
+        await discord_task
+    
+    async def close(self):
+        """Shut down the Discord client and release pooled HTTP connections"""
+        await self.discord_client.close()
+        await self._http_client.aclose()
 
 async def main():
     """Main application entry point"""
+    bot = None
     try:
         # Load configuration
         config = load_configuration()
@@ -186,7 +407,12 @@ async def main():
         await bot.start()
     
     except Exception as e:
-        logger.error(f"Application startup failed: {e}")
+        logger.error("Application startup failed: %s", e)
+    
+    finally:
+        # Release pooled connections even if we are being cancelled
+        if bot is not None:
+            await asyncio.shield(bot.close())
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
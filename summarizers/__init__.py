@@ -11,50 +11,46 @@ for adding new summarization services.
 Key Features:
 - Dynamic summarizer creation
 - Provider-based selection
-- Debugging and tracing of provider selection
 """
 
+import logging
+
+from config import LLMProvider
 from summarizers.base import BaseSummarizer
 from summarizers.deepseek import DeepSeekSummarizer
 from summarizers.anthropic import AnthropicSummarizer
 
-def create_summarizer(provider, api_key):
+logger = logging.getLogger(__name__)
+
+# Summarizer class for each supported provider
+_PROVIDERS = {
+    LLMProvider.DEEPSEEK: DeepSeekSummarizer,
+    LLMProvider.ANTHROPIC: AnthropicSummarizer,
+}
+
+def create_summarizer(provider, api_key, http_client=None):
     """
     Factory function to create the appropriate LLM summarizer based on the provider.
     
     This function dynamically selects and instantiates a summarizer class 
-    (DeepSeek or Anthropic) based on the configured LLM provider. It includes 
-    comprehensive debugging to help troubleshoot provider selection.
+    (DeepSeek or Anthropic) based on the configured LLM provider.
     
     Args:
         provider (LLMProvider): Enum value specifying the desired LLM provider 
             (either DEEPSEEK or ANTHROPIC).
         api_key (str): API key corresponding to the selected LLM provider.
+        http_client (httpx.AsyncClient, optional): Shared HTTP client for
+            provider requests, so connections are pooled across summaries.
         
     Returns:
         BaseSummarizer: An instantiated summarizer object ready to generate summaries.
         
     Raises:
         ValueError: If an unsupported LLM provider is specified.
-        
-    Debugging:
-        Prints detailed information about the provider type, value, and comparisons
-        to aid in troubleshooting provider selection.
     """
-    from config import LLMProvider
-    
-    print("=" * 50)
-    print("DETAILED PROVIDER DEBUGGING:")
-    print(f"Provider: {provider}")
-    print(f"Provider Type: {type(provider)}")
-    print(f"Provider Value: {provider.value}")
-    print(f"Provider Comparison (Deepseek): {provider == LLMProvider.DEEPSEEK}")
-    print(f"Provider Comparison (Anthropic): {provider == LLMProvider.ANTHROPIC}")
-    print("=" * 50)
+    summarizer_class = _PROVIDERS.get(provider)
+    if summarizer_class is None:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
     
-    if provider == LLMProvider.DEEPSEEK:
-        return DeepSeekSummarizer(api_key)
-    elif provider == LLMProvider.ANTHROPIC:
-        return AnthropicSummarizer(api_key)
-    else:
-        raise ValueError(f"Unsupported LLM provider: {provider}")
\ No newline at end of file
+    logger.debug("Creating %s for provider %s", summarizer_class.__name__, provider)
+    return summarizer_class(api_key, http_client=http_client)
\ No newline at end of file
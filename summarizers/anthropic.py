@@ -1,69 +1,74 @@
 import logging
-from anthropic import Anthropic
+from anthropic import APIConnectionError, AsyncAnthropic, RateLimitError
 from summarizers.base import BaseSummarizer
 from utils.prompts import PromptTemplates
 
 logger = logging.getLogger(__name__)
 
+# Retries the SDK performs, with exponential backoff, on transient errors
+MAX_API_RETRIES = 5
+
+# Maximum transcript length sent to the API
+MAX_TRANSCRIPT_CHARS = 8000
+
 class AnthropicSummarizer(BaseSummarizer):
     """Anthropic Claude implementation of the summarizer"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client=None):
         """
         Initialize with API key
         
         Args:
             api_key (str): Anthropic API key
+            http_client (httpx.AsyncClient, optional): Shared HTTP client
         """
         super().__init__(api_key)
-        self.client = Anthropic(api_key=api_key)
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            http_client=http_client,
+            max_retries=MAX_API_RETRIES
+        )
     
-    def generate_summary(
+    async def generate_summary(
         self, 
-        message_texts, 
+        messages, 
         topic_name=None, 
         prompt_type=None, 
         override_system_prompt=None, 
         override_user_prompt=None
     ):
+        # Combine the most recent useful messages that fit the length limit
+        messages = self.clean_messages(messages)
+        combined_text = self._combine_messages(messages, max_chars=MAX_TRANSCRIPT_CHARS)
+        
+        # Get appropriate prompts with potential overrides
+        system_prompt, user_prompt = PromptTemplates.resolve_prompts(
+            topic_name=topic_name, 
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=override_user_prompt
+        )
+        
+        # Stream the response so the connection is released as soon as
+        # generation finishes. Transient failures (rate limits, overload,
+        # dropped connections) are retried by the SDK; anything still failing
+        # propagates so an error is never posted as if it were a summary.
         try:
-            # Combine messages
-            combined_text = "\n".join(message_texts)
-            
-            # Truncate text if too long
-            max_tokens = 8000
-            if len(combined_text) > max_tokens:
-                combined_text = combined_text[-max_tokens:]
-            
-            # Get appropriate prompts with potential overrides
-            prompts = PromptTemplates.get_prompts(
-                topic_name=topic_name, 
-                prompt_type=prompt_type,
-                override_system_prompt=override_system_prompt,
-                override_user_prompt=override_user_prompt
-            )
-            
-            # API call with prompts
-            response = self.client.messages.create(
+            async with self.client.messages.stream(
                 model="claude-3-7-sonnet-20250219",
                 max_tokens=1000,
-                system=prompts['system_prompt'],
+                system=system_prompt,
                 messages=[
                     {
                         "role": "user",
-                        "content": PromptTemplates.format_user_prompt(
-                            combined_text, 
-                            topic_name=topic_name,
-                            prompt_type=prompt_type,
-                            override_system_prompt=override_system_prompt,
-                            override_user_prompt=override_user_prompt
-                        )
+                        "content": PromptTemplates.render_user_prompt(user_prompt, combined_text)
                     }
                 ]
-            )
-            
-            return response.content[0].text
+            ) as stream:
+                text_parts = [text async for text in stream.text_stream]
+        
+        except (APIConnectionError, RateLimitError) as e:
+            logger.error('Anthropic API unavailable after %d retries: %s', MAX_API_RETRIES, e)
+            raise
         
-        except Exception as e:
-            logger.error(f'Summary generation error: {e}')
-            return f"Unable to generate summary. Error: {str(e)}"
\ No newline at end of file
+        return "".join(text_parts)
\ No newline at end of file
@@ -1,8 +1,17 @@
 import logging
+import re
+from collections import deque
+from itertools import groupby
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+# Messages shorter than this ("ok", "+1", emoji) carry no summary value
+MIN_MESSAGE_CHARS = 3
+
+# A message consisting of nothing but a link
+_URL_ONLY_RE = re.compile(r'https?://\S+')
+
 class BaseSummarizer(ABC):
     """Base class for all summarizers"""
     
@@ -15,13 +24,72 @@ class BaseSummarizer(ABC):
         """
         self.api_key = api_key
     
+    @staticmethod
+    def clean_messages(messages):
+        """
+        Drop messages that would only add noise and tokens to the prompt
+        
+        Strips whitespace, drops very short and link-only messages, and
+        collapses runs of identical consecutive messages (e.g. reposts).
+        
+        Args:
+            messages (list): List of (sender, text) tuples
+            
+        Returns:
+            list: Cleaned (sender, text) tuples in the original order
+        """
+        stripped = (
+            (sender, text.strip())
+            for sender, text in messages
+        )
+        kept = (
+            (sender, text)
+            for sender, text in stripped
+            if len(text) >= MIN_MESSAGE_CHARS and not _URL_ONLY_RE.fullmatch(text)
+        )
+        return [next(group) for _, group in groupby(kept, key=lambda message: message[1])]
+    
+    @staticmethod
+    def _combine_messages(messages, max_chars=None):
+        """
+        Join collected messages into a single transcript
+        
+        When max_chars is given, only the most recent messages that fit are
+        formatted, so the full transcript is never built just to be cut down.
+        
+        Args:
+            messages (list): List of (sender, text) tuples
+            max_chars (int, optional): Maximum length of the transcript
+            
+        Returns:
+            str: One "sender: text" line per message
+        """
+        if max_chars is None:
+            return "\n".join(f"{sender}: {text}" for sender, text in messages)
+        
+        lines = deque()
+        size = 0
+        for sender, text in reversed(messages):
+            line = f"{sender}: {text}"
+            size += len(line) + 1
+            if size > max_chars:
+                if not lines:
+                    # A single oversized message; keep its most recent part
+                    lines.appendleft(line[-max_chars:])
+                break
+            lines.appendleft(line)
+        
+        if len(lines) < len(messages):
+            logger.info("Transcript truncated to the latest %d of %d messages", len(lines), len(messages))
+        return "\n".join(lines)
+    
     @abstractmethod
-    def generate_summary(self, message_texts, topic_name=None):
+    async def generate_summary(self, messages, topic_name=None):
         """
-        Generate a summary from message texts
+        Generate a summary from collected messages
         
         Args:
-            message_texts (list): List of text messages
+            messages (list): List of (sender, text) tuples
             topic_name (str, optional): Name of the topic or channel
             
         Returns:
@@ -1,80 +1,118 @@
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from summarizers.base import BaseSummarizer
 from utils.prompts import PromptTemplates
 
 # Get logger
 logger = logging.getLogger(__name__)
 
+# Maximum transcript length sent to the API
+MAX_TRANSCRIPT_CHARS = 8000
+
+# Per-request timeout in seconds, and retries on transient errors
+API_TIMEOUT = 60.0
+MAX_API_RETRIES = 2
+
 class DeepSeekSummarizer(BaseSummarizer):
     """DeepSeek implementation of the summarizer using OpenAI-compatible format"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client=None):
         """
         Initialize with API key
         
         Args:
             api_key (str): DeepSeek API key
+            http_client (httpx.AsyncClient, optional): Shared HTTP client
         """
         super().__init__(api_key)
-        self.client = OpenAI(
+        # Connections are pooled by the shared http_client, so every
+        # instance built on it reuses the same warm connections
+        self.client = AsyncOpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            http_client=http_client,
+            timeout=API_TIMEOUT,
+            max_retries=MAX_API_RETRIES
         )
     
-    def generate_summary(
+    async def generate_summary(
         self, 
-        message_texts, 
+        messages, 
         topic_name=None, 
         prompt_type=None, 
         override_system_prompt=None, 
         override_user_prompt=None
     ):
         try:
-            # Combine messages
-            combined_text = "\n".join(message_texts)
-            
-            # Limit combined text length
-            max_tokens = 8000
-            if len(combined_text) > max_tokens:
-                combined_text = combined_text[-max_tokens:]
+            # Combine the most recent useful messages that fit the length limit
+            messages = self.clean_messages(messages)
+            combined_text = self._combine_messages(messages, max_chars=MAX_TRANSCRIPT_CHARS)
             
             # Get appropriate prompts with potential overrides
-            prompts = PromptTemplates.get_prompts(
+            system_prompt, user_prompt = PromptTemplates.resolve_prompts(
                 topic_name=topic_name, 
                 prompt_type=prompt_type,
                 override_system_prompt=override_system_prompt,
                 override_user_prompt=override_user_prompt
             )
             
+            user_content = PromptTemplates.render_user_prompt(user_prompt, combined_text)
+            
             # Log message count
-            logger.info(f"Sending {len(message_texts)} messages to DeepSeek API")
+            logger.info("Sending %d messages to DeepSeek API", len(messages))
             
-            # Use OpenAI-compatible format for DeepSeek
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": prompts['system_prompt']
-                    },
-                    {
-                        "role": "user", 
-                        "content": PromptTemplates.format_user_prompt(
-                            combined_text, 
-                            topic_name=topic_name,
-                            prompt_type=prompt_type,
-                            override_system_prompt=override_system_prompt,
-                            override_user_prompt=override_user_prompt
-                        )
-                    }
-                ],
-                max_tokens=1000
-            )
+            # Stream the response and join the chunks once at the end
+            chunks = [
+                chunk async for chunk in self._stream_completion(system_prompt, user_content)
+            ]
+            summary = "".join(chunks)
             
             logger.info("Successfully received response from DeepSeek API")
-            return response.choices[0].message.content
+            return summary
         
         except Exception as e:
-            logger.error(f'DeepSeek summary generation error: {e}')
-            return f"Unable to generate summary with DeepSeek. Error: {str(e)}"
\ No newline at end of file
+            logger.error('DeepSeek summary generation error: %s', e)
+            return f"Unable to generate summary with DeepSeek. Error: {str(e)}"
+    
+    async def _stream_completion(self, system_prompt, user_content):
+        """
+        Request a chat completion and yield its text as it is generated
+        
+        Args:
+            system_prompt (str): System prompt for the request
+            user_content (str): Filled-in user prompt
+            
+        Yields:
+            str: Non-empty pieces of the response text
+        """
+        # Use OpenAI-compatible format for DeepSeek
+        stream = await self.client.chat.completions.create(
+            model="deepseek-chat",
+            messages=[
+                {
+                    "role": "system", 
+                    "content": system_prompt
+                },
+                {
+                    "role": "user", 
+                    "content": user_content
+                }
+            ],
+            max_tokens=1000,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        async for event in stream:
+            # Usage arrives in a final event with no choices. DeepSeek caches
+            # repeated prompt prefixes (e.g. the system prompt) automatically;
+            # report how much of this prompt was served from it.
+            if event.usage is not None:
+                cached_tokens = getattr(event.usage, 'prompt_cache_hit_tokens', None)
+                if cached_tokens is not None:
+                    logger.debug("DeepSeek prompt cache hit tokens: %s", cached_tokens)
+            
+            if event.choices:
+                delta = event.choices[0].delta.content
+                if delta:
+                    yield delta
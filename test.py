@@ -1,15 +1,19 @@
 from dotenv import load_dotenv
 import os
+import sys
 
 # Load the .env file
 load_dotenv()
 
+# Collect the report and write it out in one go
+lines = ["ALL ENVIRONMENT VARIABLES:"]
+
 # Print ALL environment variables
-print("ALL ENVIRONMENT VARIABLES:")
-for key, value in os.environ.items():
-    print(f"{key}: {value}")
+lines.extend(f"{key}: {value}" for key, value in os.environ.items())
 
 # Specifically check LLM_PROVIDER
-print("\nSpecific LLM_PROVIDER checks:")
-print("os.getenv('LLM_PROVIDER'):", repr(os.getenv('LLM_PROVIDER')))
-print("os.environ.get('LLM_PROVIDER'):", repr(os.environ.get('LLM_PROVIDER')))
\ No newline at end of file
+lines.append("\nSpecific LLM_PROVIDER checks:")
+lines.append(f"os.getenv('LLM_PROVIDER'): {os.getenv('LLM_PROVIDER')!r}")
+lines.append(f"os.environ.get('LLM_PROVIDER'): {os.environ.get('LLM_PROVIDER')!r}")
+
+sys.stdout.write("\n".join(lines) + "\n")
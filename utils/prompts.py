@@ -17,7 +17,16 @@ Key Features:
 - Fallback mechanisms
 """
 
-from typing import Dict, Optional, Any
+import re
+import sys
+import textwrap
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Any, Tuple
+
+def _prompt(text: str) -> str:
+    """Normalize a prompt literal once at import: dedented, stripped and interned."""
+    return sys.intern(textwrap.dedent(text).strip())
 
 class PromptTemplates:
     """
@@ -29,10 +38,11 @@ class PromptTemplates:
     Attributes:
         DEFAULT_SYSTEM_PROMPT (str): A generic system prompt for basic summarization.
         DEFAULT_USER_PROMPT (str): A standard template for formatting user input.
-        SPECIALIZED_PROMPTS (Dict[str, Dict[str, str]]): A collection of context-specific prompts.
+        SPECIALIZED_PROMPTS (Dict[str, Mapping[str, str]]): A collection of context-specific prompts.
+        OVERVIEW_PROMPTS (Mapping[str, str]): Prompts that combine per-source summaries.
     """
 
-    DEFAULT_SYSTEM_PROMPT: str = """
+    DEFAULT_SYSTEM_PROMPT: str = _prompt("""
     You are an expert summarization assistant designed to extract 
     key insights from complex conversations.
 
@@ -42,9 +52,9 @@ class PromptTemplates:
     3. Provide clear, structured insights
     4. Focus on actionable and meaningful content
     5. Adapt to the specific context of the conversation
-    """
+    """)
 
-    DEFAULT_USER_PROMPT: str = """
+    DEFAULT_USER_PROMPT: str = _prompt("""
     Analyze and summarize the following conversation with careful attention 
     to context, key themes, and important details.
 
@@ -56,15 +66,16 @@ class PromptTemplates:
     - Highlight main topics and notable interactions
     - Capture essential insights and potential implications
     - Maintain the original context's tone and significance
-    """
+    """)
 
-    SPECIALIZED_PROMPTS: Dict[str, Dict[str, str]] = {
-        'general': {
+    # Entries are read-only so no caller can change the shared templates
+    SPECIALIZED_PROMPTS: Dict[str, Mapping[str, str]] = {
+        'general': MappingProxyType({
             'system_prompt': DEFAULT_SYSTEM_PROMPT,
             'user_prompt': DEFAULT_USER_PROMPT
-        },
-        'defi': {
-            'system_prompt': """
+        }),
+        'defi': MappingProxyType({
+            'system_prompt': _prompt("""
             You are a specialized DeFi (Decentralized Finance) analyst 
             focusing on extracting critical insights from cryptocurrency 
             and blockchain-related discussions.
@@ -75,8 +86,8 @@ class PromptTemplates:
             3. Highlight market sentiment and trends
             4. Evaluate potential risks and rewards
             5. Detect emerging protocols and innovations
-            """,
-            'user_prompt': """
+            """),
+            'user_prompt': _prompt("""
             Conduct a comprehensive analysis of the following DeFi conversation, 
             emphasizing financial strategies, market dynamics, and technological innovations.
 
@@ -88,18 +99,50 @@ class PromptTemplates:
             - Identify unique investment perspectives
             - Assess potential market impacts
             - Provide actionable insights for DeFi participants
-            """
-        }
+            """)
+        })
     }
 
+    # Combines per-source summaries into one; only selected explicitly with
+    # prompt_type='overview', never by topic name
+    OVERVIEW_PROMPTS: Mapping[str, str] = MappingProxyType({
+        'system_prompt': _prompt("""
+        You are an expert editor who combines several existing summaries 
+        into a single overview of a community's activity.
+
+        Core Guidelines:
+        1. Merge overlapping points instead of repeating them
+        2. Surface themes that span multiple channels or topics
+        3. Keep the most important details from each summary
+        4. Stay faithful to the source summaries without adding new facts
+        """),
+        'user_prompt': _prompt("""
+        Combine the following per-channel and per-topic summaries into one 
+        overview of the day's discussions. Each entry starts with the name 
+        of the channel or topic it summarizes.
+
+        Summaries:
+        {text}
+
+        Overview Expectations:
+        - Concise yet comprehensive overview across all sources
+        - Highlight cross-topic themes and the most notable developments
+        - Mention which channel or topic a point comes from when relevant
+        """)
+    })
+
+    # Matches any specialized prompt type named in a (lowercased) topic name
+    _TOPIC_RE = re.compile('|'.join(map(re.escape, SPECIALIZED_PROMPTS)))
+
     @classmethod
+    @lru_cache(maxsize=64)
     def get_prompts(
         cls, 
         topic_name: Optional[str] = None, 
         prompt_type: Optional[str] = None, 
         override_system_prompt: Optional[str] = None, 
         override_user_prompt: Optional[str] = None
-    ) -> Dict[str, str]:
+    ) -> Mapping[str, str]:
         """
         Dynamically retrieve and customize prompts based on multiple parameters.
 
@@ -123,8 +166,9 @@ class PromptTemplates:
                 that completely replaces the selected prompt's user prompt.
 
         Returns:
-            Dict[str, str]: A dictionary containing 'system_prompt' and 'user_prompt'.
-                May include overridden prompts if specified.
+            Mapping[str, str]: A read-only mapping containing 'system_prompt' and
+                'user_prompt'. May include overridden prompts if specified.
+                Results are cached, so repeated calls return the same mapping.
 
         Examples:
             >>> prompts = PromptTemplates.get_prompts(topic_name="Yield Farming")
@@ -134,32 +178,124 @@ class PromptTemplates:
             ...     override_system_prompt="You are a crypto market analyst"
             ... )
         """
+        prompts = cls._select_prompts(topic_name, prompt_type)
+        if override_system_prompt is None and override_user_prompt is None:
+            # Shared, read-only templates
+            return prompts
+        
+        system_prompt, user_prompt = cls.resolve_prompts(
+            topic_name=topic_name, 
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=override_user_prompt
+        )
+        return MappingProxyType({'system_prompt': system_prompt, 'user_prompt': user_prompt})
+
+    @classmethod
+    def _select_prompts(
+        cls,
+        topic_name: Optional[str] = None,
+        prompt_type: Optional[str] = None
+    ) -> Mapping[str, str]:
+        """
+        Pick the specialized prompt entry for a prompt type or topic.
+
+        Returns:
+            Mapping[str, str]: The shared entry from SPECIALIZED_PROMPTS, or
+                OVERVIEW_PROMPTS for the 'overview' prompt type.
+        """
         # Determine base prompts with prioritized selection
+        if prompt_type == 'overview':
+            return cls.OVERVIEW_PROMPTS
+        
         if prompt_type and prompt_type in cls.SPECIALIZED_PROMPTS:
             # Explicit prompt type takes highest priority
-            prompts = cls.SPECIALIZED_PROMPTS[prompt_type]
-        elif topic_name:
+            return cls.SPECIALIZED_PROMPTS[prompt_type]
+        
+        if topic_name:
             # Try to find specialized prompt based on topic
-            topic_lower = topic_name.lower()
-            for key, specialized_prompts in cls.SPECIALIZED_PROMPTS.items():
-                if key in topic_lower:
-                    prompts = specialized_prompts
-                    break
-            else:
-                # Default to general if no match
-                prompts = cls.SPECIALIZED_PROMPTS['general']
-        else:
-            # Fallback to general prompts
-            prompts = cls.SPECIALIZED_PROMPTS['general']
+            match = cls._TOPIC_RE.search(topic_name.lower())
+            if match:
+                return cls.SPECIALIZED_PROMPTS[match.group(0)]
         
-        # Apply prompt overrides
+        # Default to general if no match
+        return cls.SPECIALIZED_PROMPTS['general']
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def resolve_prompts(
+        cls, 
+        topic_name: Optional[str] = None, 
+        prompt_type: Optional[str] = None, 
+        override_system_prompt: Optional[str] = None, 
+        override_user_prompt: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Select the system prompt and user prompt template for a request.
+
+        Results are cached per argument combination, so repeated summaries
+        for the same topic skip prompt selection entirely.
+
+        Args:
+            topic_name (Optional[str]): Context or topic of the conversation.
+            
+            prompt_type (Optional[str]): Explicitly specified prompt type.
+            
+            override_system_prompt (Optional[str]): Custom system prompt.
+            
+            override_user_prompt (Optional[str]): Custom user prompt.
+
+        Returns:
+            Tuple[str, str]: The system prompt and the unformatted user prompt.
+        """
+        prompts = cls._select_prompts(topic_name, prompt_type)
+        
+        # Apply prompt overrides without touching the shared templates
+        system_prompt = prompts['system_prompt']
         if override_system_prompt is not None:
-            prompts['system_prompt'] = override_system_prompt
+            system_prompt = override_system_prompt
         
+        user_prompt = prompts['user_prompt']
         if override_user_prompt is not None:
-            prompts['user_prompt'] = override_user_prompt
+            user_prompt = override_user_prompt
         
-        return prompts
+        return system_prompt, user_prompt
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _split_user_prompt(template: str) -> Optional[Tuple[str, str]]:
+        """
+        Split a user prompt template around its {text} placeholder.
+
+        Returns None when the template uses any other format syntax, in which
+        case it must go through str.format.
+        """
+        prefix, placeholder, suffix = template.partition('{text}')
+        if not placeholder or any(c in prefix + suffix for c in '{}'):
+            return None
+        return prefix, suffix
+
+    @classmethod
+    def render_user_prompt(cls, template: str, text: str) -> str:
+        """
+        Insert the conversation text into a user prompt template.
+
+        Equivalent to template.format(text=text), but simple templates are
+        split once and then filled by concatenation.
+
+        Args:
+            template (str): User prompt template containing {text}.
+            
+            text (str): The conversation or text to be summarized.
+
+        Returns:
+            str: The filled-in user prompt.
+        """
+        parts = cls._split_user_prompt(template)
+        if parts is None:
+            return template.format(text=text)
+        prefix, suffix = parts
+        return f"{prefix}{text}{suffix}"
 
     @classmethod
     def format_user_prompt(
@@ -196,10 +332,10 @@ class PromptTemplates:
             ...     topic_name="Cryptocurrency"
             ... )
         """
-        prompts = cls.get_prompts(
+        _, user_prompt = cls.resolve_prompts(
             topic_name=topic_name, 
             prompt_type=prompt_type,
             override_system_prompt=override_system_prompt,
             override_user_prompt=override_user_prompt
         )
-        return prompts['user_prompt'].format(text=text)
\ No newline at end of file
+        return cls.render_user_prompt(user_prompt, text)
\ No newline at end of file
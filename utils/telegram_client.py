@@ -0,0 +1,57 @@
+import os
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from telethon import TelegramClient
+from telethon.sessions import StringSession
+
+# Session file shared by the diagnostic scripts, so logging in once covers all of them
+SHARED_SESSION = 'shared_session'
+
+@asynccontextmanager
+async def telegram_client(session=SHARED_SESSION, api_id=None, api_hash=None, phone_number=None):
+    """
+    Open a logged-in Telegram client using credentials from the .env file
+
+    Asks for the login code (and two-step verification password) on the
+    console only when the session is not authorized yet. When
+    TELEGRAM_STRING_SESSION is set, the login is read from it instead of
+    a session file; after a fresh login the string to set is printed.
+
+    Args:
+        session (str): Name of the session file, used when no string session is set
+        api_id (int, optional): Telegram API ID, read from .env when not given
+        api_hash (str, optional): Telegram API hash, read from .env when not given
+        phone_number (str, optional): Login phone number, read from .env when not given
+
+    Yields:
+        TelegramClient: The connected client, disconnected on exit
+    """
+    # Load environment variables
+    load_dotenv()
+
+    # Get Telegram API credentials from .env unless the caller parsed them
+    if api_id is None:
+        api_id = int(os.getenv('TELEGRAM_API_ID'))
+    if api_hash is None:
+        api_hash = os.getenv('TELEGRAM_API_HASH')
+    if phone_number is None:
+        phone_number = os.getenv('TELEGRAM_PHONE_NUMBER')
+    string_session = os.getenv('TELEGRAM_STRING_SESSION')
+
+    # A string session keeps the login in memory, with no session file I/O
+    if string_session:
+        session = StringSession(string_session)
+
+    client = TelegramClient(session, api_id, api_hash)
+    try:
+        await client.connect()
+        needs_login = not await client.is_user_authorized()
+        await client.start(phone=phone_number)
+
+        if needs_login and not string_session:
+            print("To skip the session file on later runs, add this to your .env file and keep it secret:")
+            print(f"TELEGRAM_STRING_SESSION={StringSession.save(client.session)}")
+
+        yield client
+    finally:
+        await client.disconnect()
@@ -1,139 +1,276 @@
+import logging
 import os
+import re
+import sys
 import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 from dotenv import load_dotenv
-from telethon import TelegramClient
-from telethon.tl.functions.channels import GetForumTopicsRequest
+from telethon.errors import RPCError
+from clients.telegram_client import fetch_forum_topics
+from utils.telegram_client import SHARED_SESSION, telegram_client
 
-async def list_telegram_topics():
+logger = logging.getLogger(__name__)
+
+# Most dialogs listed when the channel cannot be found
+DIALOG_LIST_LIMIT = 200
+
+# Numeric channel ID: optional minus sign, optional 100 prefix, and the rest
+_CHAN_RE = re.compile(r'^(-?)(100)?(\d+)$')
+
+def _candidates(channel_id_str):
     """
-    List all topics in a Telegram forum/supergroup using credentials from the .env file
+    List the formats worth trying when resolving a channel ID
+
+    Args:
+        channel_id_str (str): Channel username or ID as written in .env
+
+    Returns:
+        tuple: (candidate, description) pairs, most likely format first
     """
-    # Load environment variables
+    candidates = [(channel_id_str, "original string format")]
+    match = _CHAN_RE.match(channel_id_str)
+    if match:
+        sign, prefix, body = match.groups()
+        candidates.append((int(channel_id_str), "integer format"))
+        if sign and prefix:
+            candidates.append((int(body), "ID without -100 prefix"))
+        else:
+            candidates.append((int(f"-100{prefix or ''}{body}"), "ID with -100 prefix"))
+    return tuple(candidates)
+
+@lru_cache(maxsize=1)
+def _env():
+    """Load the .env file once and return the settings this tool needs"""
     load_dotenv()
+    return {
+        key: os.getenv(key)
+        for key in (
+            'TELEGRAM_API_ID',
+            'TELEGRAM_API_HASH',
+            'TELEGRAM_PHONE_NUMBER',
+            'TELEGRAM_SOURCE_CHANNEL',
+        )
+    }
+
+@dataclass(frozen=True)
+class TgConfig:
+    """Validated settings for the topic finder"""
+    api_id: int
+    api_hash: str
+    phone_number: Optional[str]
+    channel_id: str
+    channel_candidates: Tuple[Tuple[Union[int, str], str], ...]
+
+@lru_cache(maxsize=1)
+def _config():
+    """
+    Parse and validate the topic finder's settings once
     
-    # Get Telegram API credentials from .env
-    api_id = int(os.getenv('TELEGRAM_API_ID'))
-    api_hash = os.getenv('TELEGRAM_API_HASH')
-    phone_number = os.getenv('TELEGRAM_PHONE_NUMBER')
-    channel_id_str = os.getenv('TELEGRAM_SOURCE_CHANNEL')
+    Returns:
+        TgConfig: Settings with the channel ID candidates already derived
+        
+    Raises:
+        RuntimeError: If a required setting is missing or invalid
+    """
+    env = _env()
+    api_id = env['TELEGRAM_API_ID']
+    api_hash = env['TELEGRAM_API_HASH']
+    channel_id_str = env['TELEGRAM_SOURCE_CHANNEL']
     
     if not api_id or not api_hash or not channel_id_str:
-        print("Error: TELEGRAM_API_ID, TELEGRAM_API_HASH, or TELEGRAM_SOURCE_CHANNEL not found in .env file")
-        return
+        raise RuntimeError("TELEGRAM_API_ID, TELEGRAM_API_HASH, or TELEGRAM_SOURCE_CHANNEL not found in .env file")
+    if not api_id.isdigit():
+        raise RuntimeError(f"TELEGRAM_API_ID must be a number, got {api_id!r}")
     
-    print(f"Using API ID: {api_id}")
-    print(f"Using channel ID: {channel_id_str}")
-    print("Connecting to Telegram...")
-    
-    # Create the client
-    client = TelegramClient('topic_finder_session', api_id, api_hash)
+    return TgConfig(
+        api_id=int(api_id),
+        api_hash=api_hash,
+        phone_number=env['TELEGRAM_PHONE_NUMBER'],
+        channel_id=channel_id_str,
+        channel_candidates=_candidates(channel_id_str)
+    )
+
+class TopicFinder:
+    """
+    Looks up forum topics over one Telegram client kept open while in use
+
+    Use as an async context manager; every lookup inside the block reuses
+    the same connection.
+    """
     
-    try:
-        # Start the client
-        await client.start(phone=phone_number)
-        print("Connected successfully!")
+    def __init__(self, config, session=SHARED_SESSION):
+        """
+        Initialize the topic finder
         
-        # Get the channel entity with multiple attempts at different formats
-        channel_entity = None
-        errors = []
+        Args:
+            config (TgConfig): Parsed credentials used to log in
+            session (str): Name of the Telegram session file
+        """
+        self.config = config
+        self.session = session
+        self.client = None
+        self._exit_stack = None
+    
+    async def __aenter__(self):
+        self._exit_stack = AsyncExitStack()
+        self.client = await self._exit_stack.enter_async_context(telegram_client(
+            self.session,
+            api_id=self.config.api_id,
+            api_hash=self.config.api_hash,
+            phone_number=self.config.phone_number
+        ))
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._exit_stack.aclose()
+        self.client = None
+    
+    async def _get_cached_entity(self, candidates):
+        """
+        Resolve the channel from the session's local entity cache
         
-        # Attempt 1: Try as is (string)
-        try:
-            channel_entity = await client.get_entity(channel_id_str)
-            print(f"Found channel using original string format: {channel_id_str}")
-        except Exception as e:
-            errors.append(f"String format failed: {str(e)}")
+        get_input_entity answers numeric IDs from the session file without
+        a network request, so only the final get_entity call goes out.
         
-        # Attempt 2: Try as integer
-        if not channel_entity and channel_id_str.lstrip('-').isdigit():
+        Args:
+            candidates (tuple): (candidate, description) pairs from _candidates
+            
+        Returns:
+            The channel entity, or None if no numeric format is cached and
+            still accessible
+        """
+        for candidate, description in candidates:
+            if not isinstance(candidate, int):
+                continue
             try:
-                channel_id_int = int(channel_id_str)
-                channel_entity = await client.get_entity(channel_id_int)
-                print(f"Found channel using integer format: {channel_id_int}")
-            except Exception as e:
-                errors.append(f"Integer format failed: {str(e)}")
-        
-        # Attempt 3: Try without -100 prefix if it has one
-        if not channel_entity and channel_id_str.startswith('-100') and channel_id_str[4:].isdigit():
+                input_entity = await self.client.get_input_entity(candidate)
+            except ValueError:
+                continue
+            
             try:
-                peer_id = int(channel_id_str[4:])
-                channel_entity = await client.get_entity(peer_id)
-                print(f"Found channel using ID without -100 prefix: {peer_id}")
-            except Exception as e:
-                errors.append(f"Without -100 prefix failed: {str(e)}")
+                channel_entity = await self.client.get_entity(input_entity)
+            except (RPCError, ValueError) as e:
+                # Cached but no longer accessible; fall back to the network lookups
+                logger.info("Cached %s %s could not be fetched: %s", description, candidate, e)
+                continue
+            
+            logger.info("Found channel in session cache using %s: %s", description, candidate)
+            return channel_entity
+        return None
+    
+    async def list_topics(self, candidates):
+        """
+        Print all topics in a Telegram forum/supergroup
         
-        # Attempt 4: Try with -100 prefix if it doesn't have one and is numeric
-        if not channel_entity and channel_id_str.lstrip('-').isdigit() and not channel_id_str.startswith('-100'):
-            # If it has a negative sign but not -100
-            if channel_id_str.startswith('-'):
-                base_id = channel_id_str[1:]
-            else:
-                base_id = channel_id_str
-                
-            try:
-                peer_id = int(f"-100{base_id}")
-                channel_entity = await client.get_entity(peer_id)
-                print(f"Found channel using ID with -100 prefix: {peer_id}")
-            except Exception as e:
-                errors.append(f"With -100 prefix failed: {str(e)}")
+        Args:
+            candidates (tuple): (candidate, description) pairs for the channel
+                ID, as returned by _candidates
+        """
+        # A channel this session has seen before needs only one request
+        channel_entity = await self._get_cached_entity(candidates)
+        errors = []
+        
+        if channel_entity is None:
+            # Get the channel entity, trying several formats of the ID at once
+            results = await asyncio.gather(
+                *(self.client.get_entity(candidate) for candidate, _ in candidates),
+                return_exceptions=True
+            )
+            
+            # Use the first format that worked, in the order above
+            for (candidate, description), result in zip(candidates, results):
+                if isinstance(result, Exception):
+                    errors.append(f"{description} failed: {str(result)}")
+                elif channel_entity is None:
+                    channel_entity = result
+                    logger.info("Found channel using %s: %s", description, candidate)
         
         # If still not found, list available dialogs to help user
         if not channel_entity:
-            print("\nCould not find the channel with any of these formats:")
+            logger.warning("Could not find the channel with any of these formats:")
             for error in errors:
-                print(f"  - {error}")
+                logger.warning("  - %s", error)
             
             print("\nHere are the channels/groups you have access to:")
             print("ID | Type | Name")
             print("-" * 50)
             
-            async for dialog in client.iter_dialogs():
-                entity_type = "Channel" if dialog.is_channel else "Group" if dialog.is_group else "Chat"
+            dialogs = await self.client.get_dialogs(limit=DIALOG_LIST_LIMIT)
+            rows = []
+            for dialog in dialogs:
+                is_channel, is_group = dialog.is_channel, dialog.is_group
+                if not (is_channel or is_group):
+                    continue
                 
-                if dialog.is_channel or dialog.is_group:
-                    print(f"{dialog.id} | {entity_type} | {dialog.name}")
+                entity_type = "Channel" if is_channel else "Group"
+                rows.append(f"{dialog.id} | {entity_type} | {dialog.name}")
+            sys.stdout.write("".join(f"{row}\n" for row in rows))
             
             print("\nTry using one of these IDs in your .env file")
             return
         
         # Check if this is a forum (supergroup with topics)
-        if not hasattr(channel_entity, 'forum') or not channel_entity.forum:
-            print(f"The channel '{channel_entity.title}' is not a forum/group with topics")
+        if not getattr(channel_entity, 'forum', False):
+            logger.warning("The channel '%s' is not a forum/group with topics", channel_entity.title)
             return
         
-        print(f"Found forum: {channel_entity.title}")
+        logger.info("Found forum: %s", channel_entity.title)
         
         # Get all topics in the forum
-        topics_result = await client(GetForumTopicsRequest(
-            channel=channel_entity,
-            offset_date=0,
-            offset_id=0,
-            offset_topic=0,
-            limit=100  # Maximum limit
-        ))
+        topics = await fetch_forum_topics(self.client, channel_entity)
         
         # Print all topics
         print("\n=== TOPICS IN FORUM ===")
         print("ID | Title")
         print("-" * 50)
         
-        for topic in topics_result.topics:
-            print(f"{topic.id} | {topic.title}")
+        sys.stdout.write("".join(f"{topic.id} | {topic.title}\n" for topic in topics))
         
         print("\n=== USAGE INSTRUCTIONS ===")
         print("1. Copy the IDs of the topics you want to monitor")
         print("2. Update your .env file:")
         print("   TELEGRAM_TOPIC_IDS=111,222,333")
         print("   (Replace with your actual topic IDs)")
+
+async def list_telegram_topics():
+    """
+    List all topics in a Telegram forum/supergroup using credentials from the .env file
+    """
+    # Get Telegram API credentials from .env
+    try:
+        config = _config()
+    except RuntimeError as e:
+        logger.error("Error: %s", e)
+        return
+    
+    logger.info("Using API ID: %s", config.api_id)
+    logger.info("Using channel ID: %s", config.channel_id)
+    logger.info("Connecting to Telegram...")
+    
+    try:
+        # Start the client on the session shared by the diagnostic scripts
+        async with TopicFinder(config) as finder:
+            logger.info("Connected successfully!")
+            await finder.list_topics(config.channel_candidates)
         
     except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    finally:
-        # Disconnect the client
-        await client.disconnect()
+        logger.exception("Error: %s", e)
 
 if __name__ == "__main__":
-    asyncio.run(list_telegram_topics())
\ No newline at end of file
+    # Status messages go to stderr, so stdout holds just the listings
+    logging.basicConfig(
+        level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO),
+        format='%(levelname)s - %(message)s'
+    )
+    logging.getLogger('telethon').setLevel(logging.WARNING)
+    
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(list_telegram_topics())
+    else:
+        uvloop.run(list_telegram_topics())
\ No newline at end of file